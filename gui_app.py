@@ -2,8 +2,14 @@ from textwrap import fill
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import ttkbootstrap as ttk
-from routine_generator import RoutineGenerator
+from routine_generator import RoutineGenerator, SOLVERS, flatten_rotation, split_rotation
+from routine_store import RoutineStore, save_json, subject_teachers
+from roster_import import read_subjects, read_assignments
+from routine_analysis import find_substitutes, format_validation
+from routine_snapshot import read_snapshot
+import copy
 import json
+import multiprocessing
 import os
 import subprocess
 import time
@@ -19,6 +25,20 @@ def get_resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
+def get_data_path(filename):
+    """Get absolute path to a data file next to the app, independent of the working directory"""
+    if getattr(sys, 'frozen', False):
+        # PyInstaller executable: keep data beside the .exe, not in the temp folder
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    
+    return os.path.join(base_path, filename)
+
+DATA_FILE = get_data_path('routine_data.json')
+DB_FILE = get_data_path('routine_data.db')
+CHECKPOINT_FILE = get_data_path('routine_checkpoint.rms')
+
 class SplashScreen(tk.Toplevel):
     def __init__(self, parent):
         super().__init__(parent)
@@ -86,7 +106,7 @@ class SplashScreen(tk.Toplevel):
             self.after(200, self.destroy)  # Close after 0.2 seconds when full
 
 class RoutineGeneratorApp:
-    def __init__(self, root):
+    def __init__(self, root, storage='sqlite'):
         # Show splash screen first
         splash = SplashScreen(root)
         root.withdraw()  # Hide main window
@@ -125,6 +145,13 @@ class RoutineGeneratorApp:
         self.subjects_list = []
         self.teachers_data = {}  # {teacher_name: [subject1, subject2, ...]}
         self.classes_data = {}   # {class_name: [subject1, subject2, ...]}
+        self.last_routines = None  # Routines from the most recent generation
+        self.last_generator = None  # Generator holding their days and time slots
+        self.last_rotation = None  # {week: routines} when they are a multi-week rotation
+        self.last_inputs = (None, None)  # Subject->teachers and class->subjects they came from
+        
+        # Storage backend: 'sqlite' updates records incrementally, 'json' rewrites routine_data.json
+        self.store = RoutineStore(DB_FILE) if storage == 'sqlite' else None
         
         # Create main notebook
         self.notebook = ttk.Notebook(root)
@@ -191,6 +218,8 @@ class RoutineGeneratorApp:
         tree_scrollbar.grid(row=0, column=1, sticky='ns')
         self.subjects_tree.configure(yscrollcommand=tree_scrollbar.set)
         
+        ttk.Button(list_frame, text="Import from File", style='secondary.TButton',
+                  command=lambda: self.import_roster('subjects')).grid(row=1, column=0, pady=5, sticky='w')
         ttk.Button(list_frame, text="Remove Selected", style='danger.TButton',
                   command=self.remove_subject).grid(row=1, column=0, columnspan=2, pady=5, sticky='e')
 
@@ -246,6 +275,8 @@ class RoutineGeneratorApp:
         tree_scrollbar.grid(row=0, column=1, sticky='ns')
         self.teachers_tree.configure(yscrollcommand=tree_scrollbar.set)
         
+        ttk.Button(list_frame, text="Import from File", style='secondary.TButton',
+                  command=lambda: self.import_roster('teachers')).grid(row=1, column=0, pady=5, sticky='w')
         ttk.Button(list_frame, text="Remove Selected", style='danger.TButton',
                   command=self.remove_teacher).grid(row=1, column=0, columnspan=2, pady=5, sticky='e')
 
@@ -301,6 +332,8 @@ class RoutineGeneratorApp:
         tree_scrollbar.grid(row=0, column=1, sticky='ns')
         self.classes_tree.configure(yscrollcommand=tree_scrollbar.set)
         
+        ttk.Button(list_frame, text="Import from File", style='secondary.TButton',
+                  command=lambda: self.import_roster('classes')).grid(row=1, column=0, pady=5, sticky='w')
         ttk.Button(list_frame, text="Remove Selected", style='danger.TButton',
                   command=self.remove_class).grid(row=1, column=0, columnspan=2, pady=5, sticky='e')
 
@@ -345,6 +378,24 @@ class RoutineGeneratorApp:
         self.start_time.insert(0, "08:30")
         self.start_time.grid(row=0, column=3, padx=5, pady=10)
         
+        # Rotation weeks (A/B weeks, term plans)
+        ttk.Label(settings_row_frame, text="Rotation weeks:", font=('Helvetica', 10, 'bold')).grid(row=0, column=4, padx=(20,5), pady=10)
+        self.weeks_spinbox = ttk.Spinbox(settings_row_frame, from_=1, to=12, width=10)
+        self.weeks_spinbox.set(1)  # Single week by default
+        self.weeks_spinbox.grid(row=0, column=5, padx=5, pady=10)
+        
+        # Scheduling algorithm
+        ttk.Label(settings_row_frame, text="Solver:", font=('Helvetica', 10, 'bold')).grid(row=1, column=0, padx=5, pady=10, sticky='w')
+        self.solver_combobox = ttk.Combobox(settings_row_frame, values=list(SOLVERS), width=18, state='readonly')
+        self.solver_combobox.set('greedy')
+        self.solver_combobox.grid(row=1, column=1, padx=5, pady=10)
+        
+        # Attempts, keeping the fullest routine (progress is checkpointed)
+        ttk.Label(settings_row_frame, text="Attempts:", font=('Helvetica', 10, 'bold')).grid(row=1, column=2, padx=(20,5), pady=10, sticky='w')
+        self.attempts_spinbox = ttk.Spinbox(settings_row_frame, from_=1, to=1000, width=20)
+        self.attempts_spinbox.set(1)
+        self.attempts_spinbox.grid(row=1, column=3, padx=5, pady=10)
+        
         ttk.Separator(settings_frame, orient='horizontal').pack(fill='x', padx=5, pady=6)
         
         # Output file settings
@@ -356,6 +407,22 @@ class RoutineGeneratorApp:
         self.output_filename.insert(0, "class_routines.xlsx")
         self.output_filename.pack(side='left', padx=5, fill='x', expand=True)
         
+        # Sharded export: one file per class or teacher
+        ttk.Button(file_frame, text="Export Shards",
+                  command=self.export_shards,
+                  style='secondary.TButton').pack(side='right', padx=5)
+        self.shard_by = ttk.Combobox(file_frame, values=['class', 'teacher'], width=8, state='readonly')
+        self.shard_by.set('class')
+        self.shard_by.pack(side='right', padx=5)
+        
+        # Snapshot buttons
+        ttk.Button(file_frame, text="Load Snapshot",
+                  command=self.load_snapshot,
+                  style='secondary.TButton').pack(side='right', padx=5)
+        ttk.Button(file_frame, text="Save Snapshot",
+                  command=self.save_snapshot,
+                  style='secondary.TButton').pack(side='right', padx=5)
+        
         # Browse button
         ttk.Button(file_frame, text="Browse", 
                   command=self.browse_save_location,
@@ -382,9 +449,29 @@ class RoutineGeneratorApp:
         ttk.Button(button_frame, text="Preview Schedule", style='info.TButton',
                   command=self.preview_schedule).pack(side='left', padx=5)
         
+        # Substitute teacher finder
+        ttk.Label(button_frame, text="Absent:").pack(side='left', padx=(20,5))
+        self.absent_teacher = ttk.Combobox(button_frame, width=15, state='readonly',
+                                           postcommand=self.update_absent_teachers)
+        self.absent_teacher.pack(side='left', padx=5)
+        self.absent_day = ttk.Combobox(button_frame, width=12, state='readonly',
+                                       values=list(self.days_vars.keys()))
+        self.absent_day.pack(side='left', padx=5)
+        self.absent_week = ttk.Combobox(button_frame, width=10, state='readonly',
+                                        postcommand=self.update_absent_weeks)
+        self.absent_week.pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Find Substitutes", style='secondary.TButton',
+                  command=self.find_substitutes).pack(side='left', padx=5)
+        
+        ttk.Button(button_frame, text="Validate File", style='secondary.TButton',
+                  command=self.validate_file).pack(side='left', padx=5)
+        
         ttk.Button(button_frame, text="Generate Routine", style='primary.TButton',
                   command=self.generate_routine).pack(side='right', padx=5)
         
+        ttk.Button(button_frame, text="Resume", style='secondary.TButton',
+                  command=self.resume_generation).pack(side='right', padx=5)
+        
         # Status label
         self.status_label = ttk.Label(generate_frame, text="")
         self.status_label.pack(pady=10)
@@ -408,7 +495,10 @@ class RoutineGeneratorApp:
         
         # Clear input
         self.subject_name.delete(0, tk.END)
-        self.save_data()
+        if self.store:
+            self.store.add_subject(subject)
+        else:
+            self.save_data()
 
     def remove_subject(self):
         selected = self.subjects_tree.selection()
@@ -416,6 +506,7 @@ class RoutineGeneratorApp:
             return
             
         # Check if subject is in use
+        removed = []
         for subject in selected:
             subject_name = self.subjects_tree.item(subject)['text']
             in_use = False
@@ -438,10 +529,14 @@ class RoutineGeneratorApp:
             
             self.subjects_list.remove(subject_name)
             self.subjects_tree.delete(subject)
+            removed.append(subject_name)
         
         # Update subjects in listboxes
         self.update_subject_listboxes()
-        self.save_data()
+        if self.store:
+            self.store.remove_subjects(removed)
+        else:
+            self.save_data()
 
     def update_subject_listboxes(self):
         # Update teachers tab subject listbox
@@ -473,7 +568,10 @@ class RoutineGeneratorApp:
         # Clear inputs
         self.teacher_name.delete(0, tk.END)
         self.subjects_listbox.selection_clear(0, tk.END)
-        self.save_data()
+        if self.store:
+            self.store.save_teacher(name, subjects)
+        else:
+            self.save_data()
 
     def add_class(self):
         name = self.class_name.get().strip()
@@ -494,33 +592,98 @@ class RoutineGeneratorApp:
         # Clear inputs
         self.class_name.delete(0, tk.END)
         self.class_subjects_listbox.selection_clear(0, tk.END)
-        self.save_data()
+        if self.store:
+            self.store.save_class(name, subjects)
+        else:
+            self.save_data()
 
     def remove_teacher(self):
         selected = self.teachers_tree.selection()
         if not selected:
             return
             
+        removed = []
         for item in selected:
             # Only remove if parent item (teacher) is selected
             if not self.teachers_tree.parent(item):
                 teacher_name = self.teachers_tree.item(item)['text']
                 del self.teachers_data[teacher_name]
                 self.teachers_tree.delete(item)
-        self.save_data()
+                removed.append(teacher_name)
+        if self.store:
+            self.store.remove_teachers(removed)
+        else:
+            self.save_data()
 
     def remove_class(self):
         selected = self.classes_tree.selection()
         if not selected:
             return
             
+        removed = []
         for item in selected:
             # Only remove if parent item (class) is selected
             if not self.classes_tree.parent(item):
                 class_name = self.classes_tree.item(item)['text']
                 del self.classes_data[class_name]
                 self.classes_tree.delete(item)
-        self.save_data()
+                removed.append(class_name)
+        if self.store:
+            self.store.remove_classes(removed)
+        else:
+            self.save_data()
+
+    def import_roster(self, kind):
+        """Bulk import subjects, teachers or classes from a CSV or Excel file"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV or Excel files", "*.csv *.xlsx"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            if kind == 'subjects':
+                entries = {}
+                new_subjects, errors = read_subjects(file_path)
+            else:
+                entries, errors = read_assignments(file_path)
+                new_subjects = [subject for subjects in entries.values() for subject in subjects]
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read file: {str(e)}")
+            return
+        
+        # Subjects referenced by teachers or classes are added as well
+        known_subjects = set(self.subjects_list)
+        added_subjects = []
+        for subject in new_subjects:
+            if subject not in known_subjects:
+                known_subjects.add(subject)
+                added_subjects.append(subject)
+        
+        self.subjects_list.extend(added_subjects)
+        if kind == 'teachers':
+            self.teachers_data.update(entries)
+        elif kind == 'classes':
+            self.classes_data.update(entries)
+        
+        # Refresh the views and persist once for the whole batch
+        self.populate_trees()
+        self.update_subject_listboxes()
+        if self.store:
+            self.store.save_many(
+                subjects=added_subjects,
+                teachers=entries if kind == 'teachers' else None,
+                classes=entries if kind == 'classes' else None
+            )
+        else:
+            self.save_data()
+        
+        message = f"Imported {len(entries) if entries else len(added_subjects)} {kind}"
+        if kind != 'subjects' and added_subjects:
+            message += f" and {len(added_subjects)} new subjects"
+        if errors:
+            message += "\n\n" + "\n".join(errors)
+        messagebox.showinfo("Import", message)
 
     def preview_schedule(self):
         try:
@@ -554,6 +717,201 @@ class RoutineGeneratorApp:
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def update_absent_teachers(self):
+        self.absent_teacher['values'] = sorted(self.teachers_data)
+
+    def update_absent_weeks(self):
+        # Weeks are only offered for rotations
+        try:
+            self.get_current_routines()
+        except Exception:
+            pass
+        rotation = self.last_rotation
+        self.absent_week['values'] = list(rotation) if rotation else []
+        if not rotation:
+            self.absent_week.set('')
+
+    def get_current_routines(self):
+        """Routines from the last generation, or else from the last exported file"""
+        if self.last_routines is None:
+            output_file = self.output_filename.get()
+            if os.path.exists(output_file):
+                generator = RoutineGenerator()
+                self.last_routines = generator.load_from_excel(output_file)
+                self.last_generator = generator
+                self.last_rotation = None
+                self.last_inputs = (None, None)
+                if generator.weeks:
+                    self.last_rotation = split_rotation(self.last_routines, generator.weeks)
+        return self.last_routines
+
+    def find_substitutes(self):
+        teacher = self.absent_teacher.get()
+        day = self.absent_day.get()
+        if not teacher or not day:
+            messagebox.showerror("Error", "Please select the absent teacher and the day!")
+            return
+        
+        try:
+            routines = self.get_current_routines()
+            if routines is None:
+                messagebox.showerror("Error", "Please generate a routine first!")
+                return
+            
+            # In a rotation each week has its own timetable
+            rotation = self.last_rotation
+            week = ''
+            if rotation:
+                week = self.absent_week.get()
+                if week not in rotation:
+                    messagebox.showerror("Error", "This is a multi-week routine, please select the week!")
+                    return
+                routines = rotation[week]
+            
+            assignments = find_substitutes(routines, self.teachers_data, teacher, day)
+            
+            when = f"{day} ({week})" if week else day
+            preview = f"Substitutes for {teacher} on {when}:\n\n"
+            if not assignments:
+                preview += f"{teacher} has no periods on {day}.\n"
+            for assignment in assignments:
+                substitute = assignment['substitute'] or "No qualified teacher free"
+                preview += (f"  • {assignment['slot']}  Class {assignment['class']} "
+                            f"({assignment['subject']}): {substitute}\n")
+            
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, preview)
+            
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def validate_file(self):
+        file_path = filedialog.askopenfilename(
+            initialfile=self.output_filename.get(),
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            reports = RoutineGenerator().validate_excel(
+                file_path, subject_teachers(self.teachers_data), self.classes_data
+            )
+            
+            preview = f"Validation of {os.path.basename(file_path)}:\n\n"
+            problems = 0
+            for week, report in reports.items():
+                lines = format_validation(report)
+                problems += len(lines)
+                if week is not None and lines:
+                    preview += f"{week}:\n"
+                for line in lines:
+                    preview += f"  • {line}\n"
+            if not problems:
+                preview += "No conflicts, missing subjects or unqualified teachers found.\n"
+            
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, preview)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def save_snapshot(self):
+        if self.last_routines is None or self.last_generator is None:
+            messagebox.showerror("Error", "Please generate a routine first!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".rms",
+            initialfile="routine_snapshot.rms",
+            filetypes=[("Routine snapshots", "*.rms"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            # Inputs the routine was generated from, not the roster loaded now
+            teachers, subjects = self.last_inputs
+            if self.last_rotation:
+                self.last_generator.save_rotation_snapshot(
+                    self.last_rotation, file_path, teachers=teachers, subjects=subjects
+                )
+            else:
+                self.last_generator.save_snapshot(
+                    self.last_routines, file_path, teachers=teachers, subjects=subjects
+                )
+            self.status_label.config(text=f"Snapshot saved as: {file_path}", foreground="green")
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def load_snapshot(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Routine snapshots", "*.rms"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            generator = RoutineGenerator()
+            routines, inputs = generator.load_snapshot(file_path)
+            rotation = split_rotation(routines, generator.weeks) if generator.weeks else None
+            self.last_routines = routines
+            self.last_generator = generator
+            self.last_rotation = rotation
+            self.last_inputs = (inputs['teachers'], inputs['subjects']) if inputs else (None, None)
+            
+            preview = "Loaded Snapshot:\n\n"
+            preview += f"Classes: {', '.join(routines)}\n"
+            preview += f"Working Days: {', '.join(generator.days)}\n"
+            preview += f"Time slots:\n"
+            for slot in generator.time_slots:
+                preview += f"  • {slot}\n"
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, preview)
+            
+            output_file = self.output_filename.get()
+            if messagebox.askyesno("Export", f"Export the loaded routine to {output_file}?"):
+                if rotation:
+                    generator.save_rotation_to_excel(rotation, output_file)
+                else:
+                    generator.save_to_excel(routines, output_file)
+                self.status_label.config(text=f"Snapshot exported as: {output_file}", foreground="green")
+                if self.auto_open_var.get():
+                    self.open_file(output_file)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def export_shards(self):
+        if self.last_routines is None or self.last_generator is None:
+            messagebox.showerror("Error", "Please generate a routine first!")
+            return
+        
+        output_dir = filedialog.askdirectory(title="Folder for the routine files")
+        if not output_dir:
+            return
+        bundle = messagebox.askyesno("Export", "Also bundle the files into a zip archive?")
+        
+        try:
+            shard_by = self.shard_by.get()
+            # Each week of a rotation gets its own folder, as the weeks share days and slots
+            if self.last_rotation:
+                parts = {week: os.path.join(output_dir, week) for week in self.last_rotation}
+                routines = self.last_rotation
+            else:
+                parts = {None: output_dir}
+                routines = {None: self.last_routines}
+            
+            count = 0
+            for part, part_dir in parts.items():
+                zip_file = None
+                if bundle:
+                    zip_file = os.path.join(output_dir, f"{part or 'routines'}.zip")
+                count += len(self.last_generator.save_sharded(
+                    routines[part], part_dir, shard_by=shard_by, zip_file=zip_file
+                ))
+            self.status_label.config(text=f"{count} routine files saved in: {output_dir}", foreground="green")
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
     def browse_save_location(self):
         initial_file = self.output_filename.get()
         file_path = filedialog.asksaveasfilename(
@@ -586,41 +944,101 @@ class RoutineGeneratorApp:
             
         try:
             periods = int(self.periods_spinbox.get())
+            weeks = int(self.weeks_spinbox.get())
+            attempts = int(self.attempts_spinbox.get())
+            if weeks > 1 and attempts > 1:
+                messagebox.showerror("Error", "Multiple attempts can't be combined with rotation weeks. "
+                                              "Set either Attempts or Rotation weeks to 1.")
+                return
             start_time = self.start_time.get()
             
             # Convert data format for routine generator
-            teachers = {}
-            for teacher, teacher_subjects in self.teachers_data.items():
-                for subject in teacher_subjects:
-                    if subject not in teachers:
-                        teachers[subject] = []
-                    teachers[subject].append(teacher)
+            teachers = subject_teachers(self.teachers_data)
+            
+            # Solvers may shuffle the lists in place, so copy them for snapshots first
+            inputs = (copy.deepcopy(teachers), copy.deepcopy(self.classes_data))
             
             generator = RoutineGenerator(
                 working_days=working_days,
                 periods_per_day=periods
             )
             
-            routines = generator.generate_routine(
-                list(self.classes_data.keys()),
-                teachers,
-                self.classes_data
-            )
-            
             output_file = self.output_filename.get()
-            generator.save_to_excel(routines, output_file)
+            if weeks > 1:
+                rotation = generator.generate_rotation(
+                    list(self.classes_data.keys()),
+                    teachers,
+                    self.classes_data,
+                    weeks=[f"Week {chr(ord('A') + i)}" for i in range(weeks)],
+                    solver=self.solver_combobox.get()
+                )
+                generator.save_rotation_to_excel(rotation, output_file)
+                self.last_routines = flatten_rotation(rotation)
+                self.last_generator = generator
+                self.last_rotation = rotation
+                self.last_inputs = inputs
+            elif attempts > 1:
+                routines = generator.generate_best_routine(
+                    list(self.classes_data.keys()),
+                    teachers,
+                    self.classes_data,
+                    attempts=attempts,
+                    solver=self.solver_combobox.get(),
+                    checkpoint_file=CHECKPOINT_FILE
+                )
+                generator.save_to_excel(routines, output_file)
+                self.last_routines = routines
+                self.last_generator = generator
+                self.last_rotation = None
+                self.last_inputs = inputs
+                self.remove_checkpoint()
+            else:
+                routines = generator.generate_routine(
+                    list(self.classes_data.keys()),
+                    teachers,
+                    self.classes_data,
+                    solver=self.solver_combobox.get()
+                )
+                generator.save_to_excel(routines, output_file)
+                self.last_routines = routines
+                self.last_generator = generator
+                self.last_rotation = None
+                self.last_inputs = inputs
             
-            success_message = f"Routine has been generated and saved as {output_file}"
+            self.show_generation_success(output_file)
+            
+        except Exception as e:
             self.status_label.config(
-                text=f"Routine generated successfully!\nSaved as: {output_file}",
-                foreground="green"
+                text=f"Error: {str(e)}",
+                foreground="red"
             )
+            messagebox.showerror("Error", str(e))
+
+    def resume_generation(self):
+        try:
+            generator = RoutineGenerator()
+            unfinished = False
+            if os.path.exists(CHECKPOINT_FILE):
+                done, planned = generator.checkpoint_status(CHECKPOINT_FILE)
+                unfinished = done < planned
+            if not unfinished:
+                # A finished job's checkpoint would re-export an old routine
+                self.remove_checkpoint()
+                messagebox.showerror("Error", "There is no unfinished generation to resume!")
+                return
             
-            if self.auto_open_var.get():
-                self.open_file(output_file)
-                success_message += "\nFile has been opened automatically."
+            checkpoint_inputs = read_snapshot(CHECKPOINT_FILE)['inputs']
+            routines = generator.generate_best_routine(checkpoint_file=CHECKPOINT_FILE, resume=True)
             
-            messagebox.showinfo("Success", success_message)
+            output_file = self.output_filename.get()
+            generator.save_to_excel(routines, output_file)
+            self.last_routines = routines
+            self.last_generator = generator
+            self.last_rotation = None
+            self.last_inputs = (checkpoint_inputs['teachers'], checkpoint_inputs['subjects'])
+            self.remove_checkpoint()
+            
+            self.show_generation_success(output_file)
             
         except Exception as e:
             self.status_label.config(
@@ -629,47 +1047,81 @@ class RoutineGeneratorApp:
             )
             messagebox.showerror("Error", str(e))
 
+    def remove_checkpoint(self):
+        if os.path.exists(CHECKPOINT_FILE):
+            os.remove(CHECKPOINT_FILE)
+
+    def show_generation_success(self, output_file):
+        success_message = f"Routine has been generated and saved as {output_file}"
+        self.status_label.config(
+            text=f"Routine generated successfully!\nSaved as: {output_file}",
+            foreground="green"
+        )
+        
+        if self.auto_open_var.get():
+            self.open_file(output_file)
+            success_message += "\nFile has been opened automatically."
+        
+        messagebox.showinfo("Success", success_message)
+
     def save_data(self):
         data = {
             'subjects': self.subjects_list,
             'teachers': self.teachers_data,
             'classes': self.classes_data
         }
-        with open('routine_data.json', 'w') as f:
-            json.dump(data, f)
+        if self.store:
+            self.store.replace_all(data)
+        else:
+            save_json(data, DATA_FILE)
 
     def load_data(self):
         try:
-            if os.path.exists('routine_data.json'):
-                with open('routine_data.json', 'r') as f:
+            data = None
+            if self.store:
+                # Migrate existing JSON data into the database on first use
+                self.store.migrate_json(DATA_FILE)
+                data = self.store.load()
+            elif os.path.exists(DATA_FILE):
+                with open(DATA_FILE, 'r') as f:
                     data = json.load(f)
-                    
+            
+            if data is not None:
                 self.subjects_list = data.get('subjects', [])
                 self.teachers_data = data.get('teachers', {})
                 self.classes_data = data.get('classes', {})
                 
                 # Update trees
-                for subject in self.subjects_list:
-                    self.subjects_tree.insert("", "end", subject, text=subject)
-                    
-                # Update teachers tree with hierarchical view
-                for name, subjects in self.teachers_data.items():
-                    teacher_id = self.teachers_tree.insert("", "end", text=name)
-                    for subject in subjects:
-                        self.teachers_tree.insert(teacher_id, "end", text=subject)
-                    
-                # Update classes tree with hierarchical view
-                for name, subjects in self.classes_data.items():
-                    class_id = self.classes_tree.insert("", "end", text=name)
-                    for subject in subjects:
-                        self.classes_tree.insert(class_id, "end", text=subject)
+                self.populate_trees()
                     
                 # Update subject listboxes
                 self.update_subject_listboxes()
         except Exception as e:
             print(f"Error loading data: {e}")
 
+    def populate_trees(self):
+        """Rebuild the subjects, teachers and classes trees from the current data"""
+        for tree in (self.subjects_tree, self.teachers_tree, self.classes_tree):
+            tree.delete(*tree.get_children())
+        
+        for subject in self.subjects_list:
+            self.subjects_tree.insert("", "end", subject, text=subject)
+            
+        # Update teachers tree with hierarchical view
+        for name, subjects in self.teachers_data.items():
+            teacher_id = self.teachers_tree.insert("", "end", text=name)
+            for subject in subjects:
+                self.teachers_tree.insert(teacher_id, "end", text=subject)
+            
+        # Update classes tree with hierarchical view
+        for name, subjects in self.classes_data.items():
+            class_id = self.classes_tree.insert("", "end", text=name)
+            for subject in subjects:
+                self.classes_tree.insert(class_id, "end", text=subject)
+
 def main():
+    # Shard workers re-launch the frozen executable, which must not open the window again
+    multiprocessing.freeze_support()
     root = ttk.Window(themename="darkly")
     app = RoutineGeneratorApp(root)
     root.mainloop()
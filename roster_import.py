@@ -0,0 +1,77 @@
+import csv
+import os
+import re
+import pandas as pd
+
+HEADER_NAMES = {'name', 'subject', 'subjects', 'teacher', 'teachers', 'class', 'classes'}
+
+
+def read_table(file_path):
+    """Read a CSV or Excel file into a DataFrame of strings without a header"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        df = pd.read_excel(file_path, header=None, dtype=str)
+    elif extension == '.csv':
+        # Rows may have different numbers of subject columns
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            df = pd.DataFrame([row for row in csv.reader(f)], dtype=str)
+    else:
+        raise ValueError(f"Unsupported file type: {extension}")
+    df = df.fillna('').apply(lambda column: column.str.strip())
+
+    # Drop a header row such as "name, subjects"
+    if len(df) and df.iloc[0, 0].lower() in HEADER_NAMES:
+        df = df.iloc[1:]
+    return df
+
+
+def read_subjects(file_path):
+    """
+    Read subject names from the first column of a CSV or Excel file
+
+    Returns:
+        tuple: (unique subject names in file order, list of error messages)
+    """
+    df = read_table(file_path)
+    names = df.iloc[:, 0] if df.shape[1] else pd.Series(dtype=str)
+    subjects = list(names[names != ''].drop_duplicates())
+    if not subjects:
+        return [], ["The file has no subject names in its first column"]
+    return subjects, []
+
+
+def read_assignments(file_path):
+    """
+    Read teachers or classes with their subjects from a CSV or Excel file
+
+    The first column holds the name. The remaining columns hold subjects,
+    either one per cell or several separated by commas or semicolons.
+    A name may appear on several rows; its subjects are combined.
+
+    Returns:
+        tuple: (dict mapping names to subject lists, list of error messages)
+    """
+    df = read_table(file_path)
+    errors = []
+    if df.shape[1] < 2:
+        return {}, ["The file needs a name column and at least one subject column"]
+
+    # One row per (name, subject) pair
+    long = df.melt(id_vars=df.columns[0], value_name='subject', ignore_index=False).sort_index(kind='stable')
+    long = long.rename(columns={df.columns[0]: 'name'})[['name', 'subject']]
+    long['subject'] = long['subject'].map(lambda value: re.split(r'[,;]', value))
+    long = long.explode('subject')
+    long['subject'] = long['subject'].str.strip()
+
+    missing_names = long[(long['name'] == '') & (long['subject'] != '')]
+    if len(missing_names):
+        errors.append(f"Skipped {len(missing_names)} subject(s) without a name")
+
+    long = long[(long['name'] != '') & (long['subject'] != '')].drop_duplicates()
+    assignments = {name: list(group['subject']) for name, group in long.groupby('name', sort=False)}
+
+    empty = set(df.iloc[:, 0]) - set(assignments) - {''}
+    if empty:
+        errors.append(f"Skipped {len(empty)} entr{'y' if len(empty) == 1 else 'ies'} without subjects: "
+                      f"{', '.join(sorted(empty))}")
+    return assignments, errors
@@ -0,0 +1,333 @@
+import pandas as pd
+
+ROUTINE_COLUMNS = ['class', 'day', 'slot', 'subject', 'teacher']
+
+
+def parse_cell(value):
+    """Split a routine cell of the form "subject\\n(teacher)" into its parts"""
+    if not value:
+        return '', ''
+    subject, _, teacher = str(value).partition('\n')
+    teacher = teacher.strip()
+    if teacher.startswith('(') and teacher.endswith(')'):
+        teacher = teacher[1:-1]
+    return subject.strip(), teacher
+
+
+def routines_to_frame(routines):
+    """
+    Flatten routines into a long DataFrame with one row per filled cell
+
+    Args:
+        routines (dict): Routines as returned by generate_routine or load_from_excel
+
+    Returns:
+        DataFrame: Columns class, day, slot, subject and teacher
+    """
+    records = [
+        (class_name, day, slot, *parse_cell(value))
+        for class_name, routine in routines.items()
+        for day, slots in routine.items()
+        for slot, value in slots.items()
+        if value
+    ]
+    return pd.DataFrame.from_records(records, columns=ROUTINE_COLUMNS)
+
+
+def validate_routines(routines, teachers, subjects):
+    """
+    Audit routines for teacher conflicts and assignment errors
+
+    Args:
+        routines (dict): Routines as returned by generate_routine or load_from_excel
+        teachers (dict): Dictionary mapping subjects to teachers
+        subjects (dict): Dictionary mapping classes to their subjects
+
+    Returns:
+        dict: 'conflicts' lists teachers booked more than once in the same
+              day and slot, 'missing_subjects' maps classes to subjects that
+              never appear in their routine, and 'unqualified' lists cells
+              where the teacher does not teach the subject
+    """
+    frame = routines_to_frame(routines)
+
+    # Teachers booked in more than one class in the same (day, slot)
+    booked = frame[frame['teacher'] != '']
+    double_booked = booked[booked.duplicated(['teacher', 'day', 'slot'], keep=False)]
+    conflicts = [
+        {'teacher': teacher, 'day': day, 'slot': slot, 'classes': sorted(group['class'])}
+        for (teacher, day, slot), group in double_booked.groupby(['teacher', 'day', 'slot'], sort=True)
+    ]
+
+    # Subjects a class should have but never gets
+    expected = pd.DataFrame(
+        [(class_name, subject) for class_name, class_subjects in subjects.items()
+         for subject in class_subjects],
+        columns=['class', 'subject']
+    ).drop_duplicates()
+    scheduled = frame[['class', 'subject']].drop_duplicates()
+    missing = expected.merge(scheduled, on=['class', 'subject'], how='left', indicator=True)
+    missing = missing[missing['_merge'] == 'left_only']
+    missing_subjects = {
+        class_name: list(group['subject'])
+        for class_name, group in missing.groupby('class', sort=False)
+    }
+
+    # Teachers placed on subjects they don't teach
+    qualified = pd.DataFrame(
+        [(subject, teacher) for subject, subject_teachers in teachers.items()
+         for teacher in subject_teachers],
+        columns=['subject', 'teacher']
+    ).drop_duplicates()
+    checked = booked.merge(qualified, on=['subject', 'teacher'], how='left', indicator=True)
+    unqualified = checked.loc[checked['_merge'] == 'left_only', ROUTINE_COLUMNS].to_dict('records')
+
+    return {
+        'conflicts': conflicts,
+        'missing_subjects': missing_subjects,
+        'unqualified': unqualified
+    }
+
+
+def format_validation(report):
+    """Describe the result of validate_routines as one readable line per problem"""
+    lines = []
+    for conflict in report['conflicts']:
+        lines.append(f"Conflict: {conflict['teacher']} teaches classes {', '.join(conflict['classes'])} "
+                     f"on {conflict['day']} at {conflict['slot']}")
+    for class_name, subjects in report['missing_subjects'].items():
+        lines.append(f"Missing: class {class_name} never has {', '.join(subjects)}")
+    for cell in report['unqualified']:
+        lines.append(f"Unqualified: {cell['teacher']} does not teach {cell['subject']} "
+                     f"(class {cell['class']}, {cell['day']} at {cell['slot']})")
+    return lines
+
+
+def build_free_teacher_index(routines, teachers_data, frame=None, day=None):
+    """
+    Index which teachers are free in every (day, slot) of the routines
+
+    Args:
+        routines (dict): Routines as returned by generate_routine or load_from_excel
+        teachers_data (dict): Dictionary mapping teachers to the subjects they teach
+        frame (DataFrame): Optional result of routines_to_frame to reuse
+        day (str): Only index this day
+
+    Returns:
+        dict: Maps (day, slot) to the set of teachers without a lesson then
+    """
+    if frame is None:
+        frame = routines_to_frame(routines)
+    if day is not None:
+        frame = frame[frame['day'] == day]
+    busy = frame.groupby(['day', 'slot'])['teacher'].agg(set).to_dict()
+    all_teachers = set(teachers_data)
+    # Every class shares the same grid, so collect the distinct keys first
+    keys = dict.fromkeys(
+        (routine_day, slot)
+        for routine in routines.values()
+        for routine_day, slots in routine.items()
+        if day is None or routine_day == day
+        for slot in slots
+    )
+    return {key: all_teachers - busy.get(key, set()) for key in keys}
+
+
+def find_substitutes(routines, teachers_data, absent_teacher, day):
+    """
+    Propose conflict-free cover for all of a teacher's periods on one day
+
+    Each period is covered by a free teacher who teaches the subject,
+    preferring whoever has the fewest periods that day. A substitute is
+    never given two classes in the same slot.
+
+    Args:
+        routines (dict): Routines as returned by generate_routine or load_from_excel
+        teachers_data (dict): Dictionary mapping teachers to the subjects they teach
+        absent_teacher (str): Name of the absent teacher
+        day (str): Day of the absence
+
+    Returns:
+        list: One dict per period with class, slot, subject and substitute
+              (None when no qualified teacher is free)
+    """
+    frame = routines_to_frame(routines)
+    day_frame = frame[frame['day'] == day]
+    free_index = build_free_teacher_index(routines, teachers_data, day_frame, day)
+    load = day_frame['teacher'].value_counts().to_dict()
+
+    qualified = {}
+    for teacher, subjects in teachers_data.items():
+        for subject in subjects:
+            qualified.setdefault(subject, set()).add(teacher)
+
+    assignments = []
+    for period in day_frame[day_frame['teacher'] == absent_teacher].to_dict('records'):
+        free = free_index.setdefault((day, period['slot']), set())
+        candidates = (qualified.get(period['subject'], set()) & free) - {absent_teacher}
+        substitute = min(candidates, key=lambda t: (load.get(t, 0), t)) if candidates else None
+        if substitute:
+            free.discard(substitute)
+            load[substitute] = load.get(substitute, 0) + 1
+        assignments.append({
+            'class': period['class'],
+            'slot': period['slot'],
+            'subject': period['subject'],
+            'substitute': substitute
+        })
+
+    # Report periods in timetable order
+    slot_order = {slot: i for routine in routines.values() for slots in routine.values()
+                  for i, slot in enumerate(slots)}
+    assignments.sort(key=lambda a: slot_order.get(a['slot'], 0))
+    return assignments
+
+
+def compute_analytics(routines):
+    """
+    Compute workload and fairness metrics for routines
+
+    Args:
+        routines (dict): Routines as returned by generate_routine or load_from_excel
+
+    Returns:
+        dict: DataFrames 'teachers' (periods per day, daily maximum and idle
+              gaps per teacher), 'classes' (filled and unfilled cells per
+              class) and 'subjects' (periods and days per class and subject)
+    """
+    frame = routines_to_frame(routines)
+    days = list(dict.fromkeys(day for routine in routines.values() for day in routine))
+    slot_index = {(day, slot): i for routine in routines.values()
+                  for day, slots in routine.items() for i, slot in enumerate(slots)}
+    frame['slot_index'] = [slot_index[key] for key in zip(frame['day'], frame['slot'])]
+
+    # Teacher workload: periods per day and idle gaps between first and last period
+    taught = frame[frame['teacher'] != '']
+    per_day = taught.pivot_table(index='teacher', columns='day', values='slot',
+                                 aggfunc='count', fill_value=0)
+    per_day = per_day.reindex(columns=days, fill_value=0)
+    spans = taught.groupby(['teacher', 'day'])['slot_index'].agg(['min', 'max', 'count'])
+    gaps = (spans['max'] - spans['min'] + 1 - spans['count']).groupby(level='teacher').sum()
+    teachers = per_day.copy()
+    teachers['Total'] = per_day.sum(axis=1)
+    teachers['Max Per Day'] = per_day.max(axis=1)
+    teachers['Idle Gaps'] = gaps.reindex(teachers.index, fill_value=0)
+    teachers = teachers.reset_index().rename(columns={'teacher': 'Teacher'})
+    teachers.columns.name = None
+
+    # Class coverage: filled versus empty cells
+    total_cells = pd.Series({class_name: sum(len(slots) for slots in routine.values())
+                             for class_name, routine in routines.items()}, dtype=int)
+    filled = frame.groupby('class').size().reindex(total_cells.index, fill_value=0)
+    distinct = frame.groupby('class')['subject'].nunique().reindex(total_cells.index, fill_value=0)
+    classes = pd.DataFrame({
+        'Class': total_cells.index,
+        'Filled': filled.values,
+        'Unfilled': (total_cells - filled).values,
+        'Fill Rate': (filled / total_cells.where(total_cells > 0)).fillna(0).round(3).values,
+        'Subjects': distinct.values
+    })
+
+    # Subject spread: how often and on how many days each subject meets
+    subjects = frame.groupby(['class', 'subject']).agg(
+        Periods=('slot', 'size'), Days=('day', 'nunique')
+    ).reset_index().rename(columns={'class': 'Class', 'subject': 'Subject'})
+
+    return {'teachers': teachers, 'classes': classes, 'subjects': subjects}
+
+
+def analytics_to_json(analytics):
+    """Convert the result of compute_analytics into JSON-serializable records"""
+    return {name: table.to_dict('records') for name, table in analytics.items()}
+
+
+def compute_rotation_analytics(rotation):
+    """
+    Compute analytics separately for each week of a rotation
+
+    Returns:
+        dict: The tables of compute_analytics with a leading 'Week' column
+    """
+    per_week = {week: compute_analytics(routines) for week, routines in rotation.items()}
+    combined = {}
+    for name in ('teachers', 'classes', 'subjects'):
+        tables = [table[name].assign(Week=week) for week, table in per_week.items()]
+        table = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+        if 'Week' in table:
+            table = table[['Week'] + [column for column in table.columns if column != 'Week']]
+        if name == 'teachers':
+            # Teachers missing from a week have no periods that week
+            table = table.fillna(0)
+        combined[name] = table
+    return combined
+
+
+class AnalyticsCollector:
+    """
+    Accumulate the metrics of compute_analytics one class routine at a time
+
+    Only per-teacher, per-class and per-subject totals are kept, so memory
+    does not grow with the number of cells. Used when routines are streamed.
+    """
+
+    def __init__(self):
+        self.days = []
+        self.teacher_days = {}  # (teacher, day) -> [periods, first slot, last slot]
+        self.class_cells = {}   # class -> [filled, total]
+        self.class_subjects = {}  # (class, subject) -> [periods, set of days]
+
+    def add(self, class_name, routine):
+        filled, total = 0, 0
+        for day, slots in routine.items():
+            if day not in self.days:
+                self.days.append(day)
+            for i, value in enumerate(slots.values()):
+                total += 1
+                if not value:
+                    continue
+                filled += 1
+                subject, teacher = parse_cell(value)
+                spread = self.class_subjects.setdefault((class_name, subject), [0, set()])
+                spread[0] += 1
+                spread[1].add(day)
+                if teacher:
+                    span = self.teacher_days.setdefault((teacher, day), [0, i, i])
+                    span[0] += 1
+                    span[1] = min(span[1], i)
+                    span[2] = max(span[2], i)
+        self.class_cells[class_name] = [filled, total]
+
+    def tables(self):
+        """Return the same tables as compute_analytics"""
+        teacher_names = sorted({teacher for teacher, _ in self.teacher_days})
+        rows = []
+        for teacher in teacher_names:
+            row = {'Teacher': teacher}
+            gaps = 0
+            for day in self.days:
+                count, first, last = self.teacher_days.get((teacher, day), (0, 0, -1))
+                row[day] = count
+                if count:
+                    gaps += last - first + 1 - count
+            row['Total'] = sum(row[day] for day in self.days)
+            row['Max Per Day'] = max((row[day] for day in self.days), default=0)
+            row['Idle Gaps'] = gaps
+            rows.append(row)
+        teachers = pd.DataFrame(rows, columns=['Teacher'] + self.days + ['Total', 'Max Per Day', 'Idle Gaps'])
+
+        subject_counts = {}
+        for class_name, _ in self.class_subjects:
+            subject_counts[class_name] = subject_counts.get(class_name, 0) + 1
+        classes = pd.DataFrame([
+            {'Class': class_name, 'Filled': filled, 'Unfilled': total - filled,
+             'Fill Rate': round(filled / total, 3) if total else 0,
+             'Subjects': subject_counts.get(class_name, 0)}
+            for class_name, (filled, total) in self.class_cells.items()
+        ], columns=['Class', 'Filled', 'Unfilled', 'Fill Rate', 'Subjects'])
+
+        subjects = pd.DataFrame([
+            {'Class': class_name, 'Subject': subject, 'Periods': periods, 'Days': len(days)}
+            for (class_name, subject), (periods, days) in sorted(self.class_subjects.items())
+        ], columns=['Class', 'Subject', 'Periods', 'Days'])
+
+        return {'teachers': teachers, 'classes': classes, 'subjects': subjects}
@@ -1,7 +1,25 @@
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import copy
+import heapq
+import json
+import multiprocessing
+import os
 import random
+import re
+import time
+import tracemalloc
+import zipfile
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.packaging.custom import StringProperty
+from routine_analysis import (parse_cell, compute_analytics, compute_rotation_analytics,
+                              analytics_to_json, validate_routines, format_validation,
+                              AnalyticsCollector)
+from routine_snapshot import read_snapshot, write_snapshot
+from routine_store import APP_DIR, RoutineStore, subject_teachers
 
 class RoutineGenerator:
     def __init__(self, working_days=None, periods_per_day=6, time_slots=None):
@@ -20,16 +38,293 @@ class RoutineGenerator:
                 self.time_slots.append(f"{start_time.strftime('%I:%M')}-{end_time.strftime('%I:%M')}")
                 start_time = end_time
         
-    def generate_routine(self, classes, teachers, subjects):
+        # Week labels and their classes when a loaded file holds a rotation
+        self.weeks = None
+        
+    def generate_routine(self, classes, teachers, subjects, solver='greedy'):
         """
         Generate routines for multiple classes ensuring no teacher conflicts
         
+        Args:
+            classes (list): List of class names
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+            solver (str): Name of a registered solver backend, see SOLVERS
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}")
+        return SOLVERS[solver](self, classes, teachers, subjects)
+    
+    def compare_solvers(self, classes, teachers, subjects, seeds=(0, 1, 2), solvers=None):
+        """
+        Run solver backends head-to-head on the same inputs and seeds
+        
+        Args:
+            classes (list): List of class names
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+            seeds (list): Random seeds, each solver is run once per seed
+            solvers (list): Solver names to compare, defaults to all registered
+        
+        Returns:
+            DataFrame: One row per run with time, peak memory, fill rate and conflicts
+        """
+        results = []
+        for solver in solvers or list(SOLVERS):
+            for seed in seeds:
+                # Solvers may reorder the subject lists, so each run gets its own copy
+                run_subjects = copy.deepcopy(subjects)
+                random.seed(seed)
+                start = time.perf_counter()
+                routines = self.generate_routine(classes, teachers, run_subjects, solver=solver)
+                elapsed = time.perf_counter() - start
+                
+                # Tracing slows solvers unevenly, so memory is measured in a separate run
+                run_subjects = copy.deepcopy(subjects)
+                random.seed(seed)
+                tracemalloc.start()
+                try:
+                    self.generate_routine(classes, teachers, run_subjects, solver=solver)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                
+                coverage = compute_analytics(routines)['classes']
+                total = coverage['Filled'].sum() + coverage['Unfilled'].sum()
+                results.append({
+                    'Solver': solver,
+                    'Seed': seed,
+                    'Time (s)': round(elapsed, 4),
+                    'Peak Memory (MB)': round(peak / 2 ** 20, 2),
+                    'Fill Rate': round(coverage['Filled'].sum() / total, 3) if total else 0,
+                    'Conflicts': len(validate_routines(routines, teachers, subjects)['conflicts'])
+                })
+        return pd.DataFrame(results)
+    
+    def checkpoint_status(self, checkpoint_file):
+        """
+        Report the progress saved in a checkpoint file
+        
+        Returns:
+            tuple: (attempts done, attempts planned)
+        """
+        meta = read_snapshot(checkpoint_file)['meta']
+        return meta['attempt'], meta['attempts']
+    
+    def generate_best_routine(self, classes=None, teachers=None, subjects=None, attempts=10,
+                              solver='greedy', checkpoint_file=None, checkpoint_every=1, resume=False):
+        """
+        Run a solver several times and keep the routine that fills the most cells
+        
+        With a checkpoint file, the search state (attempts done, random state,
+        inputs and best routines so far) is written there every checkpoint_every
+        attempts and when the run is interrupted with Ctrl-C, so the job can be
+        continued later with resume=True.
+        
+        Args:
+            classes (list): List of class names, taken from the checkpoint when resuming
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+            attempts (int): Number of solver runs
+            solver (str): Name of a registered solver backend
+            checkpoint_file (str): Optional path of the checkpoint file
+            checkpoint_every (int): Attempts between checkpoints
+            resume (bool): Continue from checkpoint_file if it exists
+        """
+        attempt = 0
+        best_routines, best_filled = None, -1
+        subjects = copy.deepcopy(subjects)
+        
+        if resume and checkpoint_file and os.path.exists(checkpoint_file):
+            snapshot = read_snapshot(checkpoint_file)
+            meta, inputs = snapshot['meta'], snapshot['inputs']
+            self.days = snapshot['days']
+            self.time_slots = snapshot['time_slots']
+            self.periods_per_day = len(self.time_slots)
+            classes, teachers, subjects = inputs['classes'], inputs['teachers'], inputs['subjects']
+            attempts, solver = meta['attempts'], meta['solver']
+            attempt = meta['attempt']
+            if attempt:
+                best_routines, best_filled = snapshot['routines'], meta['best_filled']
+            version, state, gauss_next = meta['random_state']
+            random.setstate((version, tuple(state), gauss_next))
+        elif classes is None:
+            raise ValueError("classes, teachers and subjects are required unless resuming")
+        
+        def save_checkpoint(random_state):
+            if checkpoint_file:
+                write_snapshot(
+                    checkpoint_file, self.days, self.time_slots, best_routines or {},
+                    inputs={'classes': classes, 'teachers': teachers, 'subjects': subjects},
+                    meta={'attempt': attempt, 'attempts': attempts, 'solver': solver,
+                          'best_filled': best_filled, 'random_state': random_state}
+                )
+        
+        while attempt < attempts:
+            random_state = random.getstate()
+            try:
+                # Solvers may shuffle the subject lists in place; each attempt
+                # gets a copy so the checkpointed inputs stay as they were
+                routines = self.generate_routine(classes, teachers, copy.deepcopy(subjects), solver=solver)
+            except KeyboardInterrupt:
+                # Flush progress so far; the interrupted attempt is rerun on resume
+                save_checkpoint(random_state)
+                raise
+            
+            filled = sum(1 for routine in routines.values()
+                         for slots in routine.values() for value in slots.values() if value)
+            if filled > best_filled:
+                best_routines, best_filled = routines, filled
+            attempt += 1
+            
+            if attempt % checkpoint_every == 0 or attempt == attempts:
+                save_checkpoint(random.getstate())
+        
+        return best_routines
+    
+    def generate_routine_dsatur(self, classes, teachers, subjects):
+        """
+        Generate routines by placing the most constrained lesson first
+        
+        Each day, the lessons (class, subject, teacher) form a conflict graph
+        where lessons sharing a class or a teacher can't share a slot. Slots
+        are assigned DSatur-style: the next lesson placed is always the one
+        with the most slots already blocked by its neighbours, ties broken by
+        lessons dropped on earlier days and then by the number of neighbours.
+        If the assigned teacher has no free slot, another teacher of the
+        subject is tried before the lesson is dropped.
+        
+        Args:
+            classes (list): List of class names
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+        """
+        # Give each (class, subject) one teacher, spreading load across teachers
+        load = {}
+        lessons = []
+        for class_name in classes:
+            for subject in subjects[class_name]:
+                teacher = min(teachers[subject], key=lambda t: load.get(t, 0))
+                load[teacher] = load.get(teacher, 0) + 1
+                lessons.append((class_name, subject, teacher))
+        
+        by_class = {}
+        by_teacher = {}
+        for i, (class_name, subject, teacher) in enumerate(lessons):
+            by_class.setdefault(class_name, []).append(i)
+            by_teacher.setdefault(teacher, []).append(i)
+        degree = [len(by_class[c]) + len(by_teacher[t]) - 2 for c, _, t in lessons]
+        dropped = [0] * len(lessons)
+        
+        all_routines = {class_name: {day: {slot: '' for slot in self.time_slots}
+                                     for day in self.days}
+                        for class_name in classes}
+        num_slots = len(self.time_slots)
+        
+        for day_index, day in enumerate(self.days):
+            # Start from a different slot each day so subjects move around the week
+            slot_order = [(day_index + k) % num_slots for k in range(num_slots)]
+            class_busy = {class_name: set() for class_name in by_class}
+            teacher_busy = {}
+            placed = [False] * len(lessons)
+            saturation = [0] * len(lessons)
+            heap = [(0, -dropped[i], -degree[i], i) for i in range(len(lessons))]
+            heapq.heapify(heap)
+            
+            def block(neighbours, slot, other_busy):
+                # A slot newly taken by a shared class or teacher raises saturation
+                for j in neighbours:
+                    if not placed[j] and slot not in other_busy(j):
+                        saturation[j] += 1
+                        heapq.heappush(heap, (-saturation[j], -dropped[j], -degree[j], j))
+            
+            while heap:
+                neg_saturation, _, _, i = heapq.heappop(heap)
+                if placed[i] or -neg_saturation != saturation[i]:
+                    continue
+                placed[i] = True
+                class_name, subject, teacher = lessons[i]
+                
+                candidates = [teacher] + sorted(
+                    (t for t in teachers[subject] if t != teacher),
+                    key=lambda t: len(teacher_busy.get(t, ()))
+                )
+                for candidate in candidates:
+                    busy = teacher_busy.setdefault(candidate, set())
+                    free = [k for k in slot_order
+                            if k not in class_busy[class_name] and k not in busy]
+                    if free:
+                        break
+                else:
+                    dropped[i] += 1
+                    continue
+                
+                slot = free[0]
+                all_routines[class_name][day][self.time_slots[slot]] = f"{subject}\n({candidate})"
+                block(by_class[class_name], slot,
+                      lambda j: teacher_busy.get(lessons[j][2], ()))
+                class_busy[class_name].add(slot)
+                block(by_teacher.get(candidate, ()), slot,
+                      lambda j: class_busy[lessons[j][0]])
+                teacher_busy[candidate].add(slot)
+        
+        return all_routines
+    
+    def generate_rotation(self, classes, teachers, subjects, weeks=('Week A', 'Week B'), solver='greedy'):
+        """
+        Generate a multi-week rotation from a single solved template week
+        
+        The first week is solved once. Every following week is derived from it
+        by shifting all classes' periods by one more slot per week. The same
+        shift is applied to every class, so derived weeks stay free of teacher
+        conflicts without being solved again, while each subject moves to a
+        different time of day from week to week.
+        
+        Args:
+            classes (list): List of class names
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+            weeks (list): Labels of the weeks in the rotation
+            solver (str): Solver backend used for the template week
+        
+        Returns:
+            dict: Routines for each week, keyed by week label
+        """
+        if len(weeks) > len(self.time_slots):
+            # Shifts wrap around after one per period, repeating earlier weeks
+            raise ValueError(f"A rotation can have at most {len(self.time_slots)} weeks "
+                             f"with {len(self.time_slots)} periods per day")
+        template = self.generate_routine(classes, teachers, subjects, solver=solver)
+        rotation = {}
+        for offset, week in enumerate(weeks):
+            rotation[week] = self.rotate_routines(template, offset)
+        return rotation
+    
+    def rotate_routines(self, routines, offset):
+        """Shift every class's periods later by offset slots, wrapping around the day"""
+        num_slots = len(self.time_slots)
+        return {
+            class_name: {
+                # Keys stay in time slot order, as save_to_excel expects
+                day: {slot: slots[self.time_slots[(i - offset) % num_slots]]
+                      for i, slot in enumerate(self.time_slots)}
+                for day, slots in routine.items()
+            }
+            for class_name, routine in routines.items()
+        }
+    
+    def iter_routines(self, classes, teachers, subjects):
+        """
+        Generate routines one class at a time
+        
+        Yields (class_name, routine) pairs as soon as each class is scheduled,
+        so they can be written out before the remaining classes are solved.
+        
         Args:
             classes (list): List of class names
             teachers (dict): Dictionary mapping subjects to teachers
             subjects (dict): Dictionary mapping classes to their subjects
         """
-        all_routines = {}
         teacher_schedule = {day: {slot: [] for slot in self.time_slots} 
                           for day in self.days}
         
@@ -60,12 +355,18 @@ class RoutineGenerator:
                         teacher_schedule[day][slot].append(teacher)
                         available_slots.remove(slot)
             
-            all_routines[class_name] = routine
-        
-        return all_routines
+            yield class_name, routine
     
-    def save_to_excel(self, routines, output_file):
-        """Save generated routines to an Excel file with multiple sheets"""
+    def save_to_excel(self, routines, output_file, label='Class', analytics=True, weeks=None):
+        """
+        Save generated routines to an Excel file with multiple sheets and an Analytics summary
+        
+        analytics may be False to leave out the summary, or precomputed tables
+        such as those of compute_rotation_analytics. weeks, the result of
+        rotation_weeks, marks the routines as a flattened rotation and is
+        stored in the workbook properties for load_from_excel.
+        """
+        sheet_titles = set()
         with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
             for class_name, routine in routines.items():
                 # Create DataFrame
@@ -73,10 +374,11 @@ class RoutineGenerator:
                 df.index = self.time_slots
                 
                 # Write DataFrame to Excel
-                df.to_excel(writer, sheet_name=f'Class {class_name}')
+                sheet_title = _sheet_title(f'{label} {class_name}', sheet_titles)
+                df.to_excel(writer, sheet_name=sheet_title)
                 
                 # Get the worksheet
-                worksheet = writer.sheets[f'Class {class_name}']
+                worksheet = writer.sheets[sheet_title]
                 
                 # Get workbook
                 workbook = writer.book
@@ -164,7 +466,7 @@ class RoutineGenerator:
                 title_row = 1
                 worksheet.insert_rows(1)
                 title_cell = worksheet.cell(row=title_row, column=1)
-                title_cell.value = f"Class {class_name} - Routine"
+                title_cell.value = f"{label} {class_name} - Routine"
                 title_cell.font = openpyxl.styles.Font(size=14, bold=True, color='1F4E78')
                 worksheet.merge_cells(start_row=title_row, start_column=1,
                                    end_row=title_row, end_column=len(self.days) + 1)
@@ -173,6 +475,432 @@ class RoutineGenerator:
                 
                 # Freeze panes
                 worksheet.freeze_panes = 'B3'
+            
+            if analytics is True:
+                analytics = compute_analytics(routines)
+            if analytics:
+                self._write_analytics_sheet(writer, analytics)
+            if weeks:
+                writer.book.custom_doc_props.append(
+                    StringProperty(name=ROTATION_PROPERTY, value=json.dumps(weeks)))
+
+    def _write_analytics_sheet(self, writer, analytics):
+        """Write the analytics tables one below the other on an 'Analytics' sheet"""
+        titles = ANALYTICS_TITLES
+        title_font = openpyxl.styles.Font(size=14, bold=True, color='1F4E78')
+        
+        row = 0
+        for name, table in analytics.items():
+            table.to_excel(writer, sheet_name='Analytics', startrow=row + 1, index=False)
+            worksheet = writer.sheets['Analytics']
+            title_cell = worksheet.cell(row=row + 1, column=1)
+            title_cell.value = titles[name]
+            title_cell.font = title_font
+            row += len(table) + 4
+        
+        worksheet.column_dimensions['A'].width = 20
+        for col in range(2, worksheet.max_column + 1):
+            worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 14
+
+    def save_analytics_json(self, routines, output_file):
+        """Save the analytics summary of routines as a JSON file"""
+        with open(output_file, 'w') as f:
+            json.dump(analytics_to_json(compute_analytics(routines)), f, indent=2)
+
+    def save_rotation_to_excel(self, rotation, output_file):
+        """Save a multi-week rotation to one Excel file with a sheet per class and week"""
+        # Analytics per week, as the weeks share day and slot names
+        self.save_to_excel(flatten_rotation(rotation), output_file,
+                           analytics=compute_rotation_analytics(rotation),
+                           weeks=rotation_weeks(rotation))
+
+    def save_to_excel_streaming(self, routines, output_file, label='Class', analytics=True):
+        """
+        Save routines to an Excel file as they arrive, in constant memory
+
+        Uses an openpyxl write-only workbook, so each sheet is flushed as soon
+        as it is written and the routines are never all held at once. The
+        Analytics sheet is built from running totals and written last.
+
+        Args:
+            routines: Iterable of (class_name, routine) pairs, e.g. from iter_routines
+            output_file (str): Path of the Excel file to write
+            label (str): Prefix used for sheet names and titles
+            analytics (bool): Whether to add the Analytics sheet
+        """
+        if isinstance(routines, dict):
+            routines = routines.items()
+        
+        # Define styles
+        header_fill = openpyxl.styles.PatternFill(start_color='1F4E78', end_color='1F4E78', fill_type='solid')
+        header_font = openpyxl.styles.Font(color='FFFFFF', bold=True, size=12)
+        time_fill = openpyxl.styles.PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+        time_font = openpyxl.styles.Font(bold=True, size=11)
+        row_fill = openpyxl.styles.PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
+        title_font = openpyxl.styles.Font(size=14, bold=True, color='1F4E78')
+        side = openpyxl.styles.Side(style='thin')
+        cell_border = openpyxl.styles.Border(left=side, right=side, top=side, bottom=side)
+        center = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+        wrap_center = openpyxl.styles.Alignment(horizontal='center', vertical='center', wrap_text=True)
+        
+        collector = AnalyticsCollector() if analytics else None
+        sheet_titles = set()
+        workbook = openpyxl.Workbook(write_only=True)
+        for class_name, routine in routines:
+            if collector:
+                collector.add(class_name, routine)
+            worksheet = workbook.create_sheet(_sheet_title(f'{label} {class_name}', sheet_titles))
+            
+            # Layout must be set before any rows are written
+            worksheet.column_dimensions['A'].width = 20
+            for col in range(2, len(self.days) + 2):
+                worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 30
+            worksheet.freeze_panes = 'B3'
+            last_column = openpyxl.utils.get_column_letter(len(self.days) + 1)
+            worksheet.merged_cells.add(f'A1:{last_column}1')
+            
+            # Title
+            title_cell = WriteOnlyCell(worksheet, value=f"{label} {class_name} - Routine")
+            title_cell.font = title_font
+            title_cell.alignment = openpyxl.styles.Alignment(horizontal='center')
+            worksheet.append([title_cell])
+            
+            # Day headers
+            header = [None]
+            for day in self.days:
+                cell = WriteOnlyCell(worksheet, value=day)
+                cell.fill = header_fill
+                cell.font = header_font
+                cell.border = cell_border
+                cell.alignment = center
+                header.append(cell)
+            worksheet.row_dimensions[2].height = 25
+            worksheet.append(header)
+            
+            # Time slots and lessons
+            for i, slot in enumerate(self.time_slots):
+                time_cell = WriteOnlyCell(worksheet, value=slot)
+                time_cell.fill = time_fill
+                time_cell.font = time_font
+                time_cell.border = cell_border
+                time_cell.alignment = center
+                row = [time_cell]
+                max_lines = 1
+                for day in self.days:
+                    value = routine[day][slot]
+                    cell = WriteOnlyCell(worksheet, value=value or None)
+                    cell.border = cell_border
+                    cell.alignment = wrap_center
+                    if i % 2 == 0:
+                        cell.fill = row_fill
+                    row.append(cell)
+                    if value:
+                        max_lines = max(max_lines, value.count('\n') + 1)
+                worksheet.row_dimensions[i + 3].height = max_lines * 25
+                worksheet.append(row)
+        
+        if collector:
+            tables = collector.tables()
+            worksheet = workbook.create_sheet('Analytics')
+            worksheet.column_dimensions['A'].width = 20
+            max_columns = max(len(table.columns) for table in tables.values())
+            for col in range(2, max_columns + 1):
+                worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 14
+            
+            header_style = openpyxl.styles.Font(bold=True)
+            for name, table in tables.items():
+                title_cell = WriteOnlyCell(worksheet, value=ANALYTICS_TITLES[name])
+                title_cell.font = title_font
+                worksheet.append([title_cell])
+                header = []
+                for column in table.columns:
+                    cell = WriteOnlyCell(worksheet, value=column)
+                    cell.font = header_style
+                    cell.border = cell_border
+                    cell.alignment = center
+                    header.append(cell)
+                worksheet.append(header)
+                for values in table.itertuples(index=False):
+                    worksheet.append(list(values))
+                worksheet.append([])
+                worksheet.append([])
+        
+        workbook.save(output_file)
+
+    def save_snapshot(self, routines, output_file, teachers=None, subjects=None):
+        """
+        Save routines and, optionally, their inputs as a compressed binary snapshot
+        
+        Snapshots reload in milliseconds, so routines can be re-exported or
+        compared later without solving again or parsing Excel.
+        
+        Args:
+            routines (dict): Routines as returned by generate_routine
+            output_file (str): Path of the snapshot file
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+        """
+        inputs = None
+        if teachers is not None or subjects is not None:
+            inputs = {'teachers': teachers, 'subjects': subjects}
+        write_snapshot(output_file, self.days, self.time_slots, routines, inputs)
+    
+    def save_rotation_snapshot(self, rotation, output_file, teachers=None, subjects=None):
+        """Save a multi-week rotation as a snapshot, see save_snapshot"""
+        inputs = None
+        if teachers is not None or subjects is not None:
+            inputs = {'teachers': teachers, 'subjects': subjects}
+        write_snapshot(output_file, self.days, self.time_slots, flatten_rotation(rotation),
+                       inputs, meta={'weeks': rotation_weeks(rotation)})
+    
+    def load_snapshot(self, input_file):
+        """
+        Load routines from a snapshot written by save_snapshot or save_rotation_snapshot
+        
+        The days, time slots and rotation weeks stored in the snapshot are
+        adopted by this generator so the routines can be exported as-is.
+        For a rotation the routines are flattened, see split_rotation.
+        
+        Returns:
+            tuple: (routines, inputs), inputs being None if none were saved
+        """
+        snapshot = read_snapshot(input_file)
+        self.days = snapshot['days']
+        self.time_slots = snapshot['time_slots']
+        self.periods_per_day = len(self.time_slots)
+        self.weeks = (snapshot['meta'] or {}).get('weeks')
+        return snapshot['routines'], snapshot['inputs']
+
+    def save_sharded(self, routines, output_dir, shard_by='class', max_workers=None, zip_file=None):
+        """
+        Save routines as one Excel file per class or per teacher
+
+        The shards are written concurrently in a process pool.
+
+        Args:
+            routines (dict): Routines as returned by generate_routine
+            output_dir (str): Directory the shard files are written to
+            shard_by (str): 'class' or 'teacher'
+            max_workers (int): Number of worker processes, defaults to the CPU count
+            zip_file (str): Optional path of a zip archive bundling all shards
+
+        Returns:
+            list: Paths of the written shard files
+        """
+        if shard_by == 'class':
+            label, shards = 'Class', routines
+        elif shard_by == 'teacher':
+            label, shards = 'Teacher', self.teacher_routines(routines)
+        else:
+            raise ValueError(f"Unknown shard type: {shard_by}")
+        
+        os.makedirs(output_dir, exist_ok=True)
+        jobs = []
+        used_names = set()
+        for name, routine in shards.items():
+            safe_name = re.sub(r'[^\w\- ]', '_', str(name)).strip() or '_'
+            # Names like '7.A' and '7,A' sanitise alike, so number any repeats
+            # (compared case-insensitively, as on Windows file systems)
+            unique_name, counter = safe_name, 1
+            while unique_name.lower() in used_names:
+                counter += 1
+                unique_name = f"{safe_name} ({counter})"
+            used_names.add(unique_name.lower())
+            path = os.path.join(output_dir, f"{label} {unique_name}.xlsx")
+            jobs.append((self.days, self.time_slots, label, name, routine, path))
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            output_files = list(executor.map(_write_shard, *zip(*jobs))) if jobs else []
+        
+        if zip_file:
+            # Excel files are already compressed, so store them as-is
+            with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_STORED) as archive:
+                for path in output_files:
+                    archive.write(path, os.path.basename(path))
+        
+        return output_files
+
+    def teacher_routines(self, routines):
+        """Rearrange class routines into one routine per teacher"""
+        all_routines = {}
+        for class_name, routine in routines.items():
+            for day, slots in routine.items():
+                for slot, value in slots.items():
+                    subject, teacher = parse_cell(value)
+                    if not teacher:
+                        continue
+                    if teacher not in all_routines:
+                        all_routines[teacher] = {d: {s: '' for s in self.time_slots}
+                                                 for d in self.days}
+                    all_routines[teacher][day][slot] = f"{subject}\n(Class {class_name})"
+        return all_routines
+
+    def load_from_excel(self, input_file):
+        """
+        Load routines back from an Excel file written by save_to_excel
+
+        The workbook is streamed in read-only mode so large files are parsed
+        in bounded memory. The days, time slots and rotation weeks found in
+        the workbook are adopted by this generator so the routines can be
+        saved again as-is.
+
+        Args:
+            input_file (str): Path to the Excel file
+
+        Returns:
+            dict: Routines in the same structure generate_routine returns
+        """
+        all_routines = {}
+        workbook = openpyxl.load_workbook(input_file, read_only=True)
+        try:
+            self.weeks = None
+            for prop in workbook.custom_doc_props:
+                if prop.name == ROTATION_PROPERTY:
+                    self.weeks = json.loads(prop.value)
+            for worksheet in workbook.worksheets:
+                if not worksheet.title.startswith('Class '):
+                    continue
+                class_name = worksheet.title[len('Class '):]
+                
+                rows = worksheet.iter_rows(values_only=True)
+                title_row = next(rows, None)
+                # Sheet titles may be shortened, the title cell has the full name
+                title = str(title_row[0]) if title_row and title_row[0] else ''
+                if title.startswith('Class ') and title.endswith(' - Routine'):
+                    class_name = title[len('Class '):-len(' - Routine')]
+                header = next(rows, None)
+                if not header:
+                    continue
+                days = [str(day) for day in header[1:] if day is not None]
+                
+                routine = {day: {} for day in days}
+                time_slots = []
+                for row in rows:
+                    if not row or row[0] is None:
+                        continue
+                    slot = str(row[0])
+                    time_slots.append(slot)
+                    for i, day in enumerate(days, start=1):
+                        value = row[i] if i < len(row) else None
+                        routine[day][slot] = str(value) if value is not None else ''
+                
+                all_routines[class_name] = routine
+                self.days = days
+                self.time_slots = time_slots
+                self.periods_per_day = len(time_slots)
+        finally:
+            workbook.close()
+        
+        return all_routines
+
+    def validate_excel(self, input_file, teachers, subjects):
+        """
+        Check a routine workbook, e.g. one edited by hand, with validate_routines
+        
+        Each week of a rotation workbook is checked on its own. Only the
+        classes found in the workbook are expected to have their subjects.
+        
+        Args:
+            input_file (str): Path to the Excel file
+            teachers (dict): Dictionary mapping subjects to teachers
+            subjects (dict): Dictionary mapping classes to their subjects
+        
+        Returns:
+            dict: Maps each week label (None for a single week) to its report
+        """
+        routines = self.load_from_excel(input_file)
+        weeks = split_rotation(routines, self.weeks) if self.weeks else {None: routines}
+        return {
+            week: validate_routines(
+                week_routines, teachers,
+                {name: subjects[name] for name in week_routines if name in subjects}
+            )
+            for week, week_routines in weeks.items()
+        }
+
+ANALYTICS_TITLES = {
+    'teachers': 'Teacher Workload',
+    'classes': 'Class Coverage',
+    'subjects': 'Subject Spread'
+}
+
+def _sheet_title(name, used):
+    """
+    Make a valid, unique Excel sheet title from name
+    
+    Excel limits titles to 31 characters, forbids some characters and compares
+    titles case-insensitively. used is the set of titles taken so far and is
+    updated with the result.
+    """
+    title = re.sub(r'[\[\]:*?/\\]', '_', name)
+    candidate, counter = title[:31], 1
+    while candidate.lower() in used:
+        counter += 1
+        suffix = f"~{counter}"
+        candidate = title[:31 - len(suffix)] + suffix
+    used.add(candidate.lower())
+    return candidate
+
+ROTATION_PROPERTY = 'Rotation weeks'
+
+def flatten_rotation(rotation):
+    """Turn {week: {class: routine}} into {"class (week)": routine}"""
+    return {
+        f"{class_name} ({week})": routine
+        for week, week_routines in rotation.items()
+        for class_name, routine in week_routines.items()
+    }
+
+def rotation_weeks(rotation):
+    """Map each week label of a rotation to its class names, as recorded in saved files"""
+    return {week: list(week_routines) for week, week_routines in rotation.items()}
+
+def split_rotation(routines, weeks):
+    """
+    Undo flatten_rotation, e.g. for routines loaded from a rotation workbook
+    
+    Args:
+        routines (dict): Flattened rotation
+        weeks (dict): The result of rotation_weeks, e.g. a generator's weeks
+                      after load_from_excel or load_snapshot
+    
+    Returns:
+        dict: {week: {class: routine}}
+    """
+    return {
+        week: {class_name: routines[f"{class_name} ({week})"] for class_name in class_names}
+        for week, class_names in weeks.items()
+    }
+
+SOLVERS = {}
+
+def register_solver(name):
+    """
+    Register a solver backend under a name
+    
+    A solver is a function solve(generator, classes, teachers, subjects)
+    that returns routines in the structure generate_routine returns.
+    """
+    def decorator(solve):
+        SOLVERS[name] = solve
+        return solve
+    return decorator
+
+@register_solver('greedy')
+def solve_greedy(generator, classes, teachers, subjects):
+    """Random greedy placement, class by class"""
+    return dict(generator.iter_routines(classes, teachers, subjects))
+
+@register_solver('dsatur')
+def solve_dsatur(generator, classes, teachers, subjects):
+    """Deterministic most-constrained-first placement"""
+    return generator.generate_routine_dsatur(classes, teachers, subjects)
+
+def _write_shard(days, time_slots, label, name, routine, output_file):
+    """Write a single shard in a worker process"""
+    generator = RoutineGenerator(days, len(time_slots), time_slots)
+    generator.save_to_excel({name: routine}, output_file, label=label, analytics=False)
+    return output_file
 
 def get_teacher_info():
     """Get teacher information from user input"""
@@ -221,6 +949,85 @@ def get_class_info():
     return classes, subjects
 
 def main():
+    # Shard workers re-launch the frozen executable, which must not start the app again
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Class Routine Generator")
+    parser.add_argument('--solver', choices=list(SOLVERS), default='greedy',
+                        help="scheduling algorithm to use (default: greedy)")
+    parser.add_argument('--compare', action='store_true',
+                        help="compare all solvers on the entered data instead of saving a routine")
+    parser.add_argument('--attempts', type=int, default=1,
+                        help="run the solver several times and keep the fullest routine")
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help="periodically save search progress to FILE")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the job saved in the --checkpoint file")
+    parser.add_argument('--shard', choices=['class', 'teacher'],
+                        help="write one Excel file per class or teacher instead of a single workbook")
+    parser.add_argument('--shard-dir', default='routine_shards',
+                        help="directory for the --shard files (default: routine_shards)")
+    parser.add_argument('--zip', metavar='FILE',
+                        help="also bundle the --shard files into a zip archive")
+    parser.add_argument('--validate', metavar='FILE',
+                        help="check a routine workbook, e.g. one edited by hand, and report problems")
+    parser.add_argument('--data', default=os.path.join(APP_DIR, 'routine_data.db'),
+                        help="teachers and classes for --validate, a .db or .json file "
+                             "(default: routine_data.db next to this script)")
+    args = parser.parse_args()
+    if args.zip and not args.shard:
+        parser.error("--zip requires --shard")
+    
+    if args.validate:
+        if not os.path.exists(args.data):
+            parser.error(f"data file not found: {args.data}")
+        if args.data.lower().endswith('.json'):
+            with open(args.data, 'r') as f:
+                data = json.load(f)
+        else:
+            store = RoutineStore(args.data)
+            try:
+                data = store.load()
+            finally:
+                store.close()
+        
+        reports = RoutineGenerator().validate_excel(
+            args.validate, subject_teachers(data['teachers']), data['classes'])
+        problems = 0
+        for week, report in reports.items():
+            lines = format_validation(report)
+            problems += len(lines)
+            if week is not None and lines:
+                print(f"{week}:")
+            for line in lines:
+                print(f"  {line}" if week is not None else line)
+        if problems:
+            raise SystemExit(f"\n{problems} problem(s) found in '{args.validate}'")
+        print(f"No problems found in '{args.validate}'")
+        return
+    
+    def export(generator, routines):
+        if args.shard:
+            output_files = generator.save_sharded(dict(routines), args.shard_dir,
+                                                  shard_by=args.shard, zip_file=args.zip)
+            print(f"\n{len(output_files)} routine files have been generated and saved to '{args.shard_dir}'")
+            if args.zip:
+                print(f"They are also bundled in '{args.zip}'")
+        else:
+            generator.save_to_excel_streaming(routines, 'class_routines.xlsx')
+            print("\nClass routines have been generated and saved to 'class_routines.xlsx'")
+    
+    if args.resume:
+        if not args.checkpoint or not os.path.exists(args.checkpoint):
+            parser.error("--resume requires an existing --checkpoint file")
+        generator = RoutineGenerator()
+        try:
+            routines = generator.generate_best_routine(checkpoint_file=args.checkpoint, resume=True)
+        except KeyboardInterrupt:
+            print(f"\nInterrupted, progress saved to '{args.checkpoint}'")
+            return
+        export(generator, routines)
+        return
+    
     print("Welcome to Class Routine Generator!")
     print("\nFirst, let's get information about the teachers and their subjects.")
     teachers = get_teacher_info()
@@ -247,9 +1054,28 @@ def main():
     periods_per_day = int(input("Enter number of periods per day: "))
     
     generator = RoutineGenerator(working_days, periods_per_day)
-    routines = generator.generate_routine(classes, teachers, subjects)
-    generator.save_to_excel(routines, 'class_routines.xlsx')
-    print("\nClass routines have been generated and saved to 'class_routines.xlsx'")
+    if args.compare:
+        results = generator.compare_solvers(classes, teachers, subjects)
+        print("\nSolver comparison (mean over seeds):")
+        print(results.drop(columns='Seed').groupby('Solver').mean().to_string())
+        return
+    
+    if args.attempts > 1 or args.checkpoint:
+        try:
+            routines = generator.generate_best_routine(
+                classes, teachers, subjects, attempts=args.attempts,
+                solver=args.solver, checkpoint_file=args.checkpoint
+            )
+        except KeyboardInterrupt:
+            if args.checkpoint:
+                print(f"\nInterrupted, progress saved to '{args.checkpoint}'. Rerun with --resume to continue.")
+            return
+    elif args.solver == 'greedy':
+        # Write each class as soon as it is scheduled
+        routines = generator.iter_routines(classes, teachers, subjects)
+    else:
+        routines = generator.generate_routine(classes, teachers, subjects, solver=args.solver)
+    export(generator, routines)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,118 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+MAGIC = b'RMSNAP'
+VERSION = 1
+
+
+def encode_snapshot(days, time_slots, routines, inputs=None, meta=None):
+    """
+    Encode routines into the compact binary snapshot format
+
+    Every distinct cell text is stored once in a string table and the
+    routines are stored as a flat array of indices into that table, in
+    class, day, slot order. The payload is zlib-compressed behind a magic
+    number and a format version.
+
+    Args:
+        days (list): Working days
+        time_slots (list): Time slots
+        routines (dict): Routines as returned by generate_routine
+        inputs (dict): Optional generator inputs, e.g. teachers and subjects
+        meta (dict): Optional JSON-serializable extra data
+
+    Returns:
+        bytes: The encoded snapshot
+    """
+    strings = ['']
+    string_index = {'': 0}
+    cells = array('I')
+    for routine in routines.values():
+        for day in days:
+            slots = routine.get(day, {})
+            for slot in time_slots:
+                value = slots.get(slot, '')
+                if value not in string_index:
+                    string_index[value] = len(strings)
+                    strings.append(value)
+                cells.append(string_index[value])
+    if sys.byteorder == 'big':
+        cells.byteswap()
+
+    header = json.dumps({
+        'days': list(days),
+        'time_slots': list(time_slots),
+        'classes': list(routines),
+        'strings': strings,
+        'inputs': inputs,
+        'meta': meta
+    }).encode('utf-8')
+    payload = struct.pack('<I', len(header)) + header + cells.tobytes()
+    return MAGIC + struct.pack('<H', VERSION) + zlib.compress(payload)
+
+
+def decode_snapshot(data):
+    """
+    Decode a binary snapshot
+
+    Returns:
+        dict: 'days', 'time_slots', 'routines', 'inputs' and 'meta'
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a routine snapshot")
+    (version,) = struct.unpack_from('<H', data, len(MAGIC))
+    if version > VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    payload = zlib.decompress(data[len(MAGIC) + 2:])
+    (header_length,) = struct.unpack_from('<I', payload)
+    header = json.loads(payload[4:4 + header_length].decode('utf-8'))
+    cells = array('I')
+    cells.frombytes(payload[4 + header_length:])
+    if sys.byteorder == 'big':
+        cells.byteswap()
+
+    days = header['days']
+    time_slots = header['time_slots']
+    strings = header['strings']
+    routines = {}
+    position = 0
+    for class_name in header['classes']:
+        routine = {}
+        for day in days:
+            routine[day] = {slot: strings[cells[position + i]] for i, slot in enumerate(time_slots)}
+            position += len(time_slots)
+        routines[class_name] = routine
+
+    return {
+        'days': days,
+        'time_slots': time_slots,
+        'routines': routines,
+        'inputs': header['inputs'],
+        'meta': header['meta']
+    }
+
+
+def write_snapshot(output_file, days, time_slots, routines, inputs=None, meta=None):
+    """Write a snapshot file atomically, see encode_snapshot"""
+    data = encode_snapshot(days, time_slots, routines, inputs, meta)
+    directory = os.path.dirname(os.path.abspath(output_file))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, output_file)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def read_snapshot(input_file):
+    """Read a snapshot file, see decode_snapshot"""
+    with open(input_file, 'rb') as f:
+        return decode_snapshot(f.read())
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subjects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS teachers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS teacher_subjects (
+    teacher_id INTEGER NOT NULL REFERENCES teachers(id) ON DELETE CASCADE,
+    subject_id INTEGER NOT NULL REFERENCES subjects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (teacher_id, subject_id)
+);
+CREATE TABLE IF NOT EXISTS class_subjects (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    subject_id INTEGER NOT NULL REFERENCES subjects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (class_id, subject_id)
+);
+CREATE INDEX IF NOT EXISTS idx_teacher_subjects_subject ON teacher_subjects(subject_id);
+CREATE INDEX IF NOT EXISTS idx_class_subjects_subject ON class_subjects(subject_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def save_json(data, json_file):
+    """Write data to a JSON file atomically so a crash never leaves it half-written"""
+    directory = os.path.dirname(os.path.abspath(json_file))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, json_file)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def subject_teachers(teachers_data):
+    """Turn the stored teacher -> subjects mapping into the subject -> teachers one the generator uses"""
+    teachers = {}
+    for teacher, teacher_subjects in teachers_data.items():
+        for subject in teacher_subjects:
+            teachers.setdefault(subject, []).append(teacher)
+    return teachers
+
+
+class RoutineStore:
+    """SQLite storage for subjects, teachers and classes with incremental updates"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self):
+        for table in ('subjects', 'teachers', 'classes'):
+            if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                return False
+        return True
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def migrate_json(self, json_file):
+        """
+        Import routine_data.json into the database, once
+
+        A flag in the meta table records the migration, so data removed in
+        the database later is never brought back from the old JSON file.
+
+        Returns:
+            bool: True if the JSON file was imported
+        """
+        if self.get_meta('json_migrated'):
+            return False
+        with self.conn:
+            # Databases filled before the flag existed were already migrated
+            imported = self.is_empty() and os.path.exists(json_file)
+            if imported:
+                with open(json_file, 'r') as f:
+                    self._replace_all(json.load(f))
+            self._set_meta('json_migrated', '1')
+        return imported
+
+    def load(self):
+        """
+        Load all data in the same structure as routine_data.json
+
+        Returns:
+            dict: 'subjects' list, 'teachers' and 'classes' mapping names to subject lists
+        """
+        subjects = [name for (name,) in self.conn.execute("SELECT name FROM subjects ORDER BY id")]
+        teachers = self._load_owners('teachers', 'teacher_subjects', 'teacher_id')
+        classes = self._load_owners('classes', 'class_subjects', 'class_id')
+        return {'subjects': subjects, 'teachers': teachers, 'classes': classes}
+
+    def _load_owners(self, table, link_table, owner_column):
+        owners = {name: [] for (name,) in self.conn.execute(f"SELECT name FROM {table} ORDER BY id")}
+        rows = self.conn.execute(f"""
+            SELECT o.name, s.name FROM {link_table} l
+            JOIN {table} o ON o.id = l.{owner_column}
+            JOIN subjects s ON s.id = l.subject_id
+            ORDER BY o.id, l.position
+        """)
+        for owner, subject in rows:
+            owners[owner].append(subject)
+        return owners
+
+    def add_subject(self, name):
+        with self.conn:
+            self._subject_id(name)
+
+    def remove_subjects(self, names):
+        with self.conn:
+            self.conn.executemany("DELETE FROM subjects WHERE name = ?", [(name,) for name in names])
+
+    def save_teacher(self, name, subjects):
+        with self.conn:
+            self._save_owner('teachers', 'teacher_subjects', 'teacher_id', name, subjects)
+
+    def remove_teachers(self, names):
+        with self.conn:
+            self.conn.executemany("DELETE FROM teachers WHERE name = ?", [(name,) for name in names])
+
+    def save_class(self, name, subjects):
+        with self.conn:
+            self._save_owner('classes', 'class_subjects', 'class_id', name, subjects)
+
+    def remove_classes(self, names):
+        with self.conn:
+            self.conn.executemany("DELETE FROM classes WHERE name = ?", [(name,) for name in names])
+
+    def save_many(self, subjects=(), teachers=None, classes=None):
+        """Add subjects and save teachers and classes in a single transaction"""
+        with self.conn:
+            for subject in subjects:
+                self._subject_id(subject)
+            for name, teacher_subjects in (teachers or {}).items():
+                self._save_owner('teachers', 'teacher_subjects', 'teacher_id', name, teacher_subjects)
+            for name, class_subjects in (classes or {}).items():
+                self._save_owner('classes', 'class_subjects', 'class_id', name, class_subjects)
+
+    def replace_all(self, data):
+        """Replace all stored data with data in the routine_data.json structure, in one transaction"""
+        with self.conn:
+            self._replace_all(data)
+
+    def _replace_all(self, data):
+        for table in ('class_subjects', 'teacher_subjects', 'classes', 'teachers', 'subjects'):
+            self.conn.execute(f"DELETE FROM {table}")
+        for subject in data.get('subjects', []):
+            self._subject_id(subject)
+        for name, subjects in data.get('teachers', {}).items():
+            self._save_owner('teachers', 'teacher_subjects', 'teacher_id', name, subjects)
+        for name, subjects in data.get('classes', {}).items():
+            self._save_owner('classes', 'class_subjects', 'class_id', name, subjects)
+
+    def import_json(self, json_file):
+        with open(json_file, 'r') as f:
+            self.replace_all(json.load(f))
+
+    def export_json(self, json_file):
+        save_json(self.load(), json_file)
+
+    def _subject_id(self, name):
+        self.conn.execute("INSERT OR IGNORE INTO subjects (name) VALUES (?)", (name,))
+        return self.conn.execute("SELECT id FROM subjects WHERE name = ?", (name,)).fetchone()[0]
+
+    def _save_owner(self, table, link_table, owner_column, name, subjects):
+        self.conn.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+        owner_id = self.conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+        self.conn.execute(f"DELETE FROM {link_table} WHERE {owner_column} = ?", (owner_id,))
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO {link_table} ({owner_column}, subject_id, position) VALUES (?, ?, ?)",
+            [(owner_id, self._subject_id(subject), position) for position, subject in enumerate(subjects)]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert routine data between JSON and SQLite")
+    parser.add_argument('command', choices=['import', 'export'],
+                        help="import JSON into the database, or export the database to JSON")
+    parser.add_argument('json_file', nargs='?', default=os.path.join(APP_DIR, 'routine_data.json'))
+    parser.add_argument('--db', default=os.path.join(APP_DIR, 'routine_data.db'), help="SQLite database file")
+    args = parser.parse_args()
+
+    store = RoutineStore(args.db)
+    try:
+        if args.command == 'import':
+            store.import_json(args.json_file)
+            print(f"Imported {args.json_file} into {args.db}")
+        else:
+            store.export_json(args.json_file)
+            print(f"Exported {args.db} to {args.json_file}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()